@@ -0,0 +1,185 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+_graph_kernels.pyx
+Versão compilada (Cython) dos núcleos de busca de grafo.py sobre a CSR.
+- bfs_csr / dfs_csr: ordem de visita (ids)
+- dijkstra_csr: caminho mínimo com heap indexado (decrease-key)
+Opcional: grafo.py usa este módulo se ele estiver compilado; caso contrário
+cai para numba ou para Python puro. Para compilar (no diretório do projeto):
+    cythonize -i _graph_kernels.pyx
+"""
+
+from libc.stdlib cimport malloc, calloc, free
+
+
+cdef class IndexedHeap:
+    """Min-heap de ids de vértice com decrease-key; a chave de v é key[v]."""
+    cdef int* heap
+    cdef int* pos  # índice de v no heap ou -1
+    cdef double[::1] key
+    cdef int n
+
+    def __cinit__(self, double[::1] key):
+        cdef Py_ssize_t V = key.shape[0]
+        cdef Py_ssize_t i
+        self.key = key
+        self.n = 0
+        self.heap = <int*> malloc((V + 1) * sizeof(int))
+        self.pos = <int*> malloc((V + 1) * sizeof(int))
+        if self.heap == NULL or self.pos == NULL:
+            raise MemoryError()
+        for i in range(V):
+            self.pos[i] = -1
+
+    def __dealloc__(self):
+        free(self.heap)
+        free(self.pos)
+
+    cdef inline bint empty(self):
+        return self.n == 0
+
+    cdef void push_or_decrease(self, int v):
+        """Insere v ou, se já está no heap, sobe-o após key[v] diminuir."""
+        cdef int i = self.pos[v]
+        if i < 0:
+            i = self.n
+            self.heap[i] = v
+            self.n += 1
+        self._sift_up(i)
+
+    cdef int pop(self):
+        cdef int u = self.heap[0]
+        self.pos[u] = -1
+        self.n -= 1
+        if self.n > 0:
+            self.heap[0] = self.heap[self.n]
+            self._sift_down(0)
+        return u
+
+    cdef void _sift_up(self, int i):
+        cdef int v = self.heap[i]
+        cdef double d = self.key[v]
+        cdef int parent, p
+        while i > 0:
+            parent = (i - 1) >> 1
+            p = self.heap[parent]
+            if self.key[p] <= d:
+                break
+            self.heap[i] = p
+            self.pos[p] = i
+            i = parent
+        self.heap[i] = v
+        self.pos[v] = i
+
+    cdef void _sift_down(self, int i):
+        cdef int v = self.heap[i]
+        cdef double d = self.key[v]
+        cdef int c, child
+        while True:
+            c = 2 * i + 1
+            if c >= self.n:
+                break
+            if c + 1 < self.n and self.key[self.heap[c + 1]] < self.key[self.heap[c]]:
+                c += 1
+            child = self.heap[c]
+            if d <= self.key[child]:
+                break
+            self.heap[i] = child
+            self.pos[child] = i
+            i = c
+        self.heap[i] = v
+        self.pos[v] = i
+
+
+cpdef list bfs_csr(const int[::1] indptr, const int[::1] indices, int source):
+    """Ordem de visita BFS (ids). Cada vértice entra na fila uma vez: a fila é a ordem."""
+    cdef Py_ssize_t V = indptr.shape[0] - 1
+    cdef int* queue = <int*> malloc((V + 1) * sizeof(int))
+    cdef unsigned char* visited = <unsigned char*> calloc(V + 1, 1)
+    cdef Py_ssize_t head = 0, tail = 0, k
+    cdef int u, v
+    if queue == NULL or visited == NULL:
+        free(queue)
+        free(visited)
+        raise MemoryError()
+    try:
+        queue[tail] = source
+        tail += 1
+        visited[source] = 1
+        while head < tail:
+            u = queue[head]
+            head += 1
+            for k in range(indptr[u], indptr[u + 1]):
+                v = indices[k]
+                if not visited[v]:
+                    visited[v] = 1
+                    queue[tail] = v
+                    tail += 1
+        return [queue[k] for k in range(tail)]
+    finally:
+        free(queue)
+        free(visited)
+
+
+cpdef list dfs_csr(const int[::1] indptr, const int[::1] indices, int source):
+    """Ordem de visita DFS iterativa (ids), mesma ordem da versão em Python."""
+    cdef Py_ssize_t V = indptr.shape[0] - 1
+    cdef Py_ssize_t E = indices.shape[0]
+    # cada vértice visitado empilha no máximo seus vizinhos: E + 1 entradas bastam
+    cdef int* stack = <int*> malloc((E + 1) * sizeof(int))
+    cdef unsigned char* visited = <unsigned char*> calloc(V + 1, 1)
+    cdef Py_ssize_t top = 0, k
+    cdef int u, v
+    cdef list order = []
+    if stack == NULL or visited == NULL:
+        free(stack)
+        free(visited)
+        raise MemoryError()
+    try:
+        stack[top] = source
+        top += 1
+        while top > 0:
+            top -= 1
+            u = stack[top]
+            if visited[u]:
+                continue
+            visited[u] = 1
+            order.append(u)
+            # empilhar vizinhos (inverso para ordem natural)
+            k = indptr[u + 1] - 1
+            while k >= indptr[u]:
+                v = indices[k]
+                if not visited[v]:
+                    stack[top] = v
+                    top += 1
+                k -= 1
+        return order
+    finally:
+        free(stack)
+        free(visited)
+
+
+cpdef void dijkstra_csr(const int[::1] indptr, const int[::1] indices, const double[::1] weights,
+                        int source, int target, double[::1] dist, int[::1] prev):
+    """
+    Mesmo contrato de grafo._dijkstra_csr: preenche dist/prev já alocados
+    (inf / -1) e, com target >= 0, para assim que target sai do heap.
+    """
+    cdef IndexedHeap heap = IndexedHeap(dist)
+    cdef Py_ssize_t k
+    cdef int u, v
+    cdef double d, alt
+    dist[source] = 0.0
+    heap.push_or_decrease(source)
+    while not heap.empty():
+        u = heap.pop()
+        if u == target:
+            break
+        d = dist[u]
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            alt = d + weights[k]
+            if alt < dist[v]:
+                dist[v] = alt
+                prev[v] = u
+                heap.push_or_decrease(v)
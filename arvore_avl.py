@@ -3,157 +3,429 @@ arvore_avl.py
 Implementação de Árvore AVL (balanceamento automático).
 Funcionalidades:
 - insert, remove, search
+- bulk_load: construção balanceada a partir de chaves ordenadas
 - rotações (simples e duplas)
 - percursos: inorder / preorder / postorder
+Os nós ficam num pool de arrays paralelos indexados por inteiro (filhos, pai,
+bf e carimbo em arrays tipados; chave, nome e dados em listas); AVLNode é apenas
+uma vista criada ao devolver um nó ao chamador, e os percursos entregam a visit
+um AVLEntry com os campos já lidos do pool.
+O módulo é todo anotado e pode ser compilado antecipadamente com mypyc
+(`mypyc arvore_avl.py`); sem a extensão gerada, o import usa este .py.
+Uma rubro-negra com a mesma interface foi comparada e não compensou aqui: em
+Python puro o custo da inserção está em descer a árvore e criar o nó, não em
+atualizar os bf, e ela inseria mais devagar que este pool.
 Complexidade:
 - Inserção/Remoção/Busca: O(log n)
 """
 
-from typing import Optional, Callable, Any
+from array import array
+from typing import Optional, Callable, Iterator, List, Tuple, Any
 from grafo import Graph  # cada cidade terá um grafo local
 
+NIL = -1  # índice de "nenhum nó" no pool
+
 
 class AVLNode:
-    def __init__(self, key: int, name: str = "", data: Any = None):
+    """
+    Vista de um nó do pool de uma AVLTree; lê e escreve direto nos arrays.
+    Criada por search e root (não se constrói AVLNode(key, ...)); os percursos
+    entregam AVLEntry.
+    Ciclo de vida: a vista guarda o carimbo do slot ao ser criada; depois que o
+    nó é removido (ou a árvore recarregada por bulk_load) qualquer acesso levanta
+    ReferenceError, mesmo que o slot já tenha sido reaproveitado por outra cidade.
+    Duas vistas do mesmo nó são iguais (==), mas não o mesmo objeto (is).
+    Não há mais o atributo height: o nó guarda só o fator de balanceamento (bf).
+    """
+    __slots__ = ('tree', 'index', 'stamp')
+
+    def __init__(self, tree: 'AVLTree', index: int):
+        self.tree = tree
+        self.index = index
+        self.stamp = tree._stamps[index]
+
+    def _slot(self) -> int:
+        stamps = self.tree._stamps
+        if self.index >= len(stamps) or stamps[self.index] != self.stamp:
+            raise ReferenceError("nó removido da árvore")
+        return self.index
+
+    def _view(self, i: int) -> Optional['AVLNode']:
+        return AVLNode(self.tree, i) if i != NIL else None
+
+    def __eq__(self, other: object) -> bool:
+        return (isinstance(other, AVLNode) and self.tree is other.tree
+                and self.index == other.index and self.stamp == other.stamp)
+
+    def __hash__(self) -> int:
+        return hash((id(self.tree), self.index, self.stamp))
+
+    @property
+    def key(self) -> int:
+        return self.tree._keys[self._slot()]
+
+    @key.setter
+    def key(self, value: int) -> None:
+        # como antes, trocar a chave não reposiciona o nó na árvore
+        self.tree._keys[self._slot()] = value
+
+    @property
+    def name(self) -> str:
+        return self.tree._names[self._slot()]
+
+    @name.setter
+    def name(self, value: str) -> None:
+        self.tree._names[self._slot()] = value
+
+    @property
+    def data(self) -> Any:
+        return self.tree._data[self._slot()]
+
+    @data.setter
+    def data(self, value: Any) -> None:
+        self.tree._data[self._slot()] = value
+
+    @property
+    def left(self) -> Optional['AVLNode']:
+        return self._view(self.tree._left[self._slot()])
+
+    @property
+    def right(self) -> Optional['AVLNode']:
+        return self._view(self.tree._right[self._slot()])
+
+    @property
+    def parent(self) -> Optional['AVLNode']:
+        return self._view(self.tree._parent[self._slot()])
+
+    @property
+    def bf(self) -> int:
+        # fator de balanceamento = altura(esq) - altura(dir), sempre em {-1, 0, 1}
+        return self.tree._bf[self._slot()]
+
+    def __repr__(self) -> str:
+        return f"AVLNode(key={self.key}, name='{self.name}', bf={self.bf})"
+
+
+class AVLEntry:
+    """
+    Nó entregue a visit pelos percursos: cópia de (key, name, data, bf) lida
+    direto dos arrays, sem vista nem carimbo a checar. Guardar um AVLEntry é
+    seguro (não passa a apontar para outra cidade), mas atribuir a ele não
+    altera a árvore; para alterar o nó ou navegar a partir dele, use
+    search(entry.key).
+    """
+    __slots__ = ('key', 'name', 'data', 'bf')
+
+    def __init__(self, key: int, name: str, data: Any, bf: int):
         self.key = key
         self.name = name
-        self.data = data if data is not None else None
-        self.left: Optional['AVLNode'] = None
-        self.right: Optional['AVLNode'] = None
-        self.height = 1
+        self.data = data
+        self.bf = bf
 
-    def __repr__(self):
-        return f"AVLNode(key={self.key}, name='{self.name}', h={self.height})"
+    def __repr__(self) -> str:
+        return f"AVLEntry(key={self.key}, name='{self.name}', bf={self.bf})"
 
 
 class AVLTree:
-    def __init__(self):
-        self.root: Optional[AVLNode] = None
+    def __init__(self) -> None:
+        # carimbos nunca se repetem na vida da árvore (nem após bulk_load)
+        self._next_stamp = 0
+        self._clear()
+
+    def _clear(self) -> None:
+        # pool de nós: o nó i é (_keys[i], _left[i], _right[i], _parent[i], _bf[i],
+        # _names[i], _data[i]); índices removidos voltam para _free.
+        # _stamps[i] identifica o nó que ocupa o slot (-1 = livre) e invalida
+        # vistas antigas quando o slot é liberado ou reaproveitado
+        # chaves ficam em lista: são int do Python, sem limite de faixa
+        self._keys: List[int] = []
+        self._left: 'array[int]' = array('i')
+        self._right: 'array[int]' = array('i')
+        self._parent: 'array[int]' = array('i')
+        self._bf: 'array[int]' = array('b')
+        self._names: List[str] = []
+        self._data: List[Any] = []
+        self._free: List[int] = []
+        self._stamps: 'array[int]' = array('q')
+        self._root: int = NIL
+        self.size: int = 0  # número de nós, mantido por insert/remove
 
-    def _height(self, node: Optional[AVLNode]) -> int:
-        return node.height if node else 0
+    @property
+    def root(self) -> Optional[AVLNode]:
+        return AVLNode(self, self._root) if self._root != NIL else None
 
-    def _update_height(self, node: AVLNode):
-        node.height = 1 + max(self._height(node.left), self._height(node.right))
+    def _new_node(self, key: int, name: str, data: Any, parent: int) -> int:
+        if self._free:
+            i = self._free.pop()
+            self._keys[i] = key
+            self._left[i] = NIL
+            self._right[i] = NIL
+            self._parent[i] = parent
+            self._bf[i] = 0
+            self._names[i] = name
+            self._data[i] = data
+            self._stamps[i] = self._next_stamp
+            self._next_stamp += 1
+            return i
+        self._keys.append(key)
+        self._left.append(NIL)
+        self._right.append(NIL)
+        self._parent.append(parent)
+        self._bf.append(0)
+        self._names.append(name)
+        self._data.append(data)
+        self._stamps.append(self._next_stamp)
+        self._next_stamp += 1
+        return len(self._keys) - 1
 
-    def _balance_factor(self, node: AVLNode) -> int:
-        return self._height(node.left) - self._height(node.right)
+    def _free_node(self, i: int) -> None:
+        self._names[i] = ""
+        self._data[i] = None  # solta o grafo da cidade
+        self._stamps[i] = -1
+        self._free.append(i)
 
-    def _rotate_right(self, y: AVLNode) -> AVLNode:
-        x = y.left
-        T2 = x.right
-        x.right = y
-        y.left = T2
-        self._update_height(y)
-        self._update_height(x)
+    def _replace_child(self, parent: int, old: int, new: int) -> None:
+        if parent == NIL:
+            self._root = new
+        elif self._left[parent] == old:
+            self._left[parent] = new
+        else:
+            self._right[parent] = new
+
+    # As rotações atualizam os fatores de balanceamento pelas transições
+    # clássicas da AVL, sem recalcular alturas.
+    def _rotate_right(self, y: int) -> int:
+        left, right, parent, bf = self._left, self._right, self._parent, self._bf
+        x = left[y]
+        T2 = right[x]
+        right[x] = y
+        left[y] = T2
+        if T2 != NIL:
+            parent[T2] = y
+        parent[x] = parent[y]
+        parent[y] = x
+        self._replace_child(parent[x], y, x)
+        bf[y] = bf[y] - 1 - max(bf[x], 0)
+        bf[x] = bf[x] - 1 + min(bf[y], 0)
         return x
 
-    def _rotate_left(self, x: AVLNode) -> AVLNode:
-        y = x.right
-        T2 = y.left
-        y.left = x
-        x.right = T2
-        self._update_height(x)
-        self._update_height(y)
+    def _rotate_left(self, x: int) -> int:
+        left, right, parent, bf = self._left, self._right, self._parent, self._bf
+        y = right[x]
+        T2 = left[y]
+        left[y] = x
+        right[x] = T2
+        if T2 != NIL:
+            parent[T2] = x
+        parent[y] = parent[x]
+        parent[x] = y
+        self._replace_child(parent[y], x, y)
+        bf[x] = bf[x] + 1 - min(bf[y], 0)
+        bf[y] = bf[y] + 1 + max(bf[x], 0)
         return y
 
-    def _rebalance(self, node: AVLNode) -> AVLNode:
-        self._update_height(node)
-        bf = self._balance_factor(node)
+    def _rebalance(self, node: int) -> int:
+        bf = self._bf
         # Left heavy
-        if bf > 1:
-            if self._balance_factor(node.left) < 0:
-                node.left = self._rotate_left(node.left)
+        if bf[node] > 1:
+            if bf[self._left[node]] < 0:
+                self._rotate_left(self._left[node])
             return self._rotate_right(node)
         # Right heavy
-        if bf < -1:
-            if self._balance_factor(node.right) > 0:
-                node.right = self._rotate_right(node.right)
+        if bf[node] < -1:
+            if bf[self._right[node]] > 0:
+                self._rotate_right(self._right[node])
             return self._rotate_left(node)
         return node
 
-    def insert(self, key: int, name: str = "", data: Any = None):
+    def insert(self, key: int, name: str = "", data: Any = None) -> None:
         """Insere e rebalanceia automaticamente. O(log n) amortizado."""
-        def _insert(node, key, name, data):
-            if node is None:
-                # se não passou data, cria um novo Graph para a cidade
-                if data is None:
-                    data = {'graph': Graph()}
-                return AVLNode(key, name, data)
-            if key < node.key:
-                node.left = _insert(node.left, key, name, data)
-            elif key > node.key:
-                node.right = _insert(node.right, key, name, data)
+        keys, left, right = self._keys, self._left, self._right
+        parent = NIL
+        node = self._root
+        while node != NIL:
+            parent = node
+            if key < keys[node]:
+                node = left[node]
+            elif key > keys[node]:
+                node = right[node]
             else:
                 # atualiza
-                node.name = name
-                node.data = data or node.data
+                self._names[node] = name
+                self._data[node] = data or self._data[node]
+                return
+        # se não passou data, cria um novo Graph para a cidade
+        if data is None:
+            data = {'graph': Graph()}
+        node = self._new_node(key, name, data, parent)
+        self.size += 1
+        if parent == NIL:
+            self._root = node
+            return
+        if key < keys[parent]:
+            left[parent] = node
+        else:
+            right[parent] = node
+        # sobe pelos pais enquanto a altura da subárvore cresce
+        bf = self._bf
+        while parent != NIL:
+            bf[parent] += 1 if left[parent] == node else -1
+            if bf[parent] == 0:
+                return
+            if bf[parent] in (1, -1):
+                node = parent
+                parent = self._parent[parent]
+                continue
+            # |bf| == 2: uma rotação restaura a altura anterior
+            self._rebalance(parent)
+            return
+
+    def bulk_load(self, items: List[Tuple[int, str, Any]]) -> None:
+        """
+        Substitui o conteúdo da árvore por (key, name, data) em ordem estritamente
+        crescente de chave (use sorted() antes se preciso). Monta a árvore pelo
+        ponto médio, já balanceada: O(n), sem nenhuma rotação.
+        """
+        self._clear()
+
+        def build(lo: int, hi: int, parent: int) -> Tuple[int, int]:
+            # retorna (subárvore, altura) para calcular o bf de baixo para cima
+            if lo > hi:
+                return NIL, 0
+            mid = (lo + hi) // 2
+            key, name, data = items[mid]
+            if data is None:
+                data = {'graph': Graph()}
+            node = self._new_node(key, name, data, parent)
+            self._left[node], hl = build(lo, mid - 1, node)
+            self._right[node], hr = build(mid + 1, hi, node)
+            self._bf[node] = hl - hr
+            return node, 1 + max(hl, hr)
+        self._root, _ = build(0, len(items) - 1, NIL)
+        self.size = len(items)
+
+    def _find(self, key: int) -> int:
+        keys, left, right = self._keys, self._left, self._right
+        node = self._root
+        while node != NIL:
+            k = keys[node]
+            if key == k:
                 return node
-            return self._rebalance(node)
-        self.root = _insert(self.root, key, name, data)
+            node = left[node] if key < k else right[node]
+        return NIL
 
     def search(self, key: int) -> Optional[AVLNode]:
-        node = self.root
-        while node:
-            if key == node.key:
-                return node
-            elif key < node.key:
-                node = node.left
-            else:
-                node = node.right
-        return None
+        node = self._find(key)
+        return AVLNode(self, node) if node != NIL else None
 
-    def _min_node(self, node: AVLNode) -> AVLNode:
-        current = node
-        while current.left:
-            current = current.left
-        return current
+    def _min_node(self, node: int) -> int:
+        left = self._left
+        while left[node] != NIL:
+            node = left[node]
+        return node
 
-    def remove(self, key: int):
+    def remove(self, key: int) -> None:
         """Remove e rebalanceia. O(log n)."""
-        def _remove(node, key):
-            if node is None:
-                return None
-            if key < node.key:
-                node.left = _remove(node.left, key)
-            elif key > node.key:
-                node.right = _remove(node.right, key)
+        node = self._find(key)
+        if node == NIL:
+            return
+        self.size -= 1
+        left, right, parent_of, bf = self._left, self._right, self._parent, self._bf
+        if left[node] != NIL and right[node] != NIL:
+            # religa o sucessor no lugar do nó (em vez de copiar os dados), assim
+            # vistas do sucessor continuam válidas e só as do nó removido expiram
+            successor = self._min_node(right[node])
+            if parent_of[successor] == node:
+                parent = successor
+                from_left = False
             else:
-                # nó encontrado
-                if node.left is None:
-                    return node.right
-                elif node.right is None:
-                    return node.left
-                else:
-                    successor = self._min_node(node.right)
-                    node.key = successor.key
-                    node.name = successor.name
-                    node.data = successor.data
-                    node.right = _remove(node.right, successor.key)
-            return self._rebalance(node) if node else None
-        self.root = _remove(self.root, key)
-
-    # percursos
-    def inorder(self, visit: Callable[[AVLNode], None]):
-        def _inorder(node):
-            if node:
-                _inorder(node.left)
-                visit(node)
-                _inorder(node.right)
-        _inorder(self.root)
-
-    def preorder(self, visit: Callable[[AVLNode], None]):
-        def _preorder(node):
-            if node:
-                visit(node)
-                _preorder(node.left)
-                _preorder(node.right)
-        _preorder(self.root)
-
-    def postorder(self, visit: Callable[[AVLNode], None]):
-        def _postorder(node):
-            if node:
-                _postorder(node.left)
-                _postorder(node.right)
-                visit(node)
-        _postorder(self.root)
+                parent = parent_of[successor]
+                from_left = True
+                child = right[successor]
+                left[parent] = child
+                if child != NIL:
+                    parent_of[child] = parent
+                right[successor] = right[node]
+                parent_of[right[node]] = successor
+            left[successor] = left[node]
+            parent_of[left[node]] = successor
+            bf[successor] = bf[node]
+            parent_of[successor] = parent_of[node]
+            self._replace_child(parent_of[node], node, successor)
+        else:
+            child = left[node] if left[node] != NIL else right[node]
+            parent = parent_of[node]
+            from_left = parent != NIL and left[parent] == node
+            self._replace_child(parent, node, child)
+            if child != NIL:
+                parent_of[child] = parent
+        self._free_node(node)
+        # sobe pelos pais enquanto a altura da subárvore diminui
+        while parent != NIL:
+            bf[parent] += -1 if from_left else 1
+            if bf[parent] in (1, -1):
+                return
+            if bf[parent] != 0:
+                sibling = left[parent] if bf[parent] > 0 else right[parent]
+                sibling_bf = bf[sibling]
+                parent = self._rebalance(parent)
+                if sibling_bf == 0:
+                    return
+            node = parent
+            parent = parent_of[node]
+            from_left = parent != NIL and left[parent] == node
+
+    # percursos (iterativos, com pilha explícita; geradores de índices do pool
+    # permitem parar cedo sem criar uma vista por nó)
+    def _iter_inorder(self) -> Iterator[int]:
+        left, right = self._left, self._right
+        stack: List[int] = []
+        node = self._root
+        while stack or node != NIL:
+            while node != NIL:
+                stack.append(node)
+                node = left[node]
+            node = stack.pop()
+            yield node
+            node = right[node]
+
+    def _iter_preorder(self) -> Iterator[int]:
+        left, right = self._left, self._right
+        stack: List[int] = [self._root] if self._root != NIL else []
+        while stack:
+            node = stack.pop()
+            yield node
+            if right[node] != NIL:
+                stack.append(right[node])
+            if left[node] != NIL:
+                stack.append(left[node])
+
+    def _iter_postorder(self) -> Iterator[int]:
+        left, right = self._left, self._right
+        # cada nó entra duas vezes: na primeira empilha os filhos, na segunda é visitado
+        stack: List[Tuple[int, bool]] = [(self._root, False)] if self._root != NIL else []
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                yield node
+                continue
+            stack.append((node, True))
+            if right[node] != NIL:
+                stack.append((right[node], False))
+            if left[node] != NIL:
+                stack.append((left[node], False))
+
+    def _visit_all(self, order: Iterator[int], visit: Callable[[AVLEntry], None]) -> None:
+        # os índices vêm do próprio percurso, logo estão vivos: lê direto dos arrays
+        keys, names, data, bf = self._keys, self._names, self._data, self._bf
+        for i in order:
+            visit(AVLEntry(keys[i], names[i], data[i], bf[i]))
+
+    def inorder(self, visit: Callable[[AVLEntry], None]) -> None:
+        self._visit_all(self._iter_inorder(), visit)
+
+    def preorder(self, visit: Callable[[AVLEntry], None]) -> None:
+        self._visit_all(self._iter_preorder(), visit)
+
+    def postorder(self, visit: Callable[[AVLEntry], None]) -> None:
+        self._visit_all(self._iter_postorder(), visit)
@@ -4,12 +4,13 @@ Implementação de uma Árvore Binária de Busca (BST) com:
 - insert, search, remove
 - percursos recursivos: inorder, preorder, postorder
 - função opcional de balanceamento pelo algoritmo DSW (Day–Stout–Warren)
+- construção balanceada direta a partir de chaves ordenadas (from_sorted)
 Complexidade:
 - Inserção/Busca/Remoção: O(h) (onde h é a altura; pior caso O(n))
 - Percursos: O(n)
 """
 
-from typing import Optional, Callable, List, Any
+from typing import Optional, Callable, List, Tuple, Any
 
 
 class BSTNode:
@@ -27,11 +28,33 @@ class BSTNode:
 class BinarySearchTree:
     def __init__(self):
         self.root: Optional[BSTNode] = None
+        self.size = 0  # número de nós, mantido por insert/remove
+
+    @classmethod
+    def from_sorted(cls, items: List[Tuple[int, str, Any]]) -> 'BinarySearchTree':
+        """
+        Constrói uma BST já balanceada a partir de (key, name, data) em ordem
+        crescente de chave, escolhendo sempre o ponto médio como raiz. O(n).
+        """
+        def build(lo, hi):
+            if lo > hi:
+                return None
+            mid = (lo + hi) // 2
+            key, name, data = items[mid]
+            node = BSTNode(key, name, data)
+            node.left = build(lo, mid - 1)
+            node.right = build(mid + 1, hi)
+            return node
+        tree = cls()
+        tree.root = build(0, len(items) - 1)
+        tree.size = len(items)
+        return tree
 
     def insert(self, key: int, name: str = "", data: Any = None):
         """Insere (key, name, data) na BST."""
         def _insert(node, key, name, data):
             if node is None:
+                self.size += 1
                 return BSTNode(key, name, data)
             if key < node.key:
                 node.left = _insert(node.left, key, name, data)
@@ -74,8 +97,10 @@ class BinarySearchTree:
             else:
                 # encontrado
                 if node.left is None:
+                    self.size -= 1
                     return node.right
                 elif node.right is None:
+                    self.size -= 1
                     return node.left
                 else:
                     successor = self._min_node(node.right)
@@ -154,27 +179,18 @@ class BinarySearchTree:
         1) transforma em vine (lista)
         2) calcula m = 2^floor(log2(n+1)) - 1
         3) primeiro compress n - m vezes, depois repetidamente compress m/2, m/4...
+        n vem do contador self.size, sem percorrer a árvore antes de balancear; ele só
+        é exato se a árvore foi montada por insert/remove/from_sorted (nós ligados à
+        mão via root não contam, e com size <= 1 nada é feito).
         Complexidade: O(n)
         """
-        # contar nós
-        n = 0
-        node = self.root
-        # conta usando inorder
-        def _count(nod):
-            nonlocal n
-            if nod:
-                _count(nod.left)
-                n += 1
-                _count(nod.right)
-        _count(self.root)
+        n = self.size
         if n <= 1:
             return
         self._tree_to_vine()
-        # maior m = 2^floor(log2(n+1)) - 1
-        m = 1
-        while m <= n:
-            m = m << 1
-        m = (m >> 1) - 1
+        # maior m = 2^floor(log2(n+1)) - 1; para n = 2^k - 1 dá m = n (zero
+        # rotações na primeira passada)
+        m = (1 << ((n + 1).bit_length() - 1)) - 1
         self._compress(n - m)
         while m > 1:
             m = m >> 1
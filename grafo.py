@@ -4,105 +4,327 @@ Implementação de grafo por lista de adjacência.
 - BFS (Busca em Largura)
 - DFS (Busca em Profundidade)
 - Dijkstra (caminho mínimo com heap)
+Para as buscas, a lista de adjacência é compilada (freeze) em CSR: vértices
+numerados 0..V-1 e arestas em arrays tipados (indptr / indices / weights).
+Os núcleos sobre a CSR usam, nesta ordem de preferência, a extensão Cython
+_graph_kernels (se compilada), numba (se instalado) ou Python puro. Por isso
+este módulo não é compilado com mypyc: a escolha rebinda funções no import.
 Complexidades:
 - BFS/DFS: O(V + E)
 - Dijkstra: O(E log V) (usando heap)
+- freeze: O(V + E), refeito apenas depois de alterações no grafo
 """
 
-from collections import deque, defaultdict
-import heapq
-from typing import Dict, List, Tuple, Any, Set
+from array import array
+from collections import deque
+import sys
+from typing import Deque, Dict, List, MutableSequence, Sequence, Tuple, Any, Optional
+
+try:
+    import numpy as np  # type: ignore
+    from numba import njit  # type: ignore
+except ImportError:  # numba é opcional: sem ele o kernel roda em Python puro
+    np = None
+    njit = None
+
+_INF = float('inf')
+# quantas origens de Dijkstra ficam memorizadas por grafo (cada uma custa O(V))
+_DIJKSTRA_CACHE_SIZE = 4
+
+
+def _bfs_csr(indptr: Sequence[int], indices: Sequence[int], source: int) -> List[int]:
+    """Ordem de visita BFS (ids) sobre a CSR."""
+    visited = bytearray(len(indptr) - 1)
+    order: List[int] = []
+    q: Deque[int] = deque()
+    q.append(source)
+    visited[source] = 1
+    while q:
+        u = q.popleft()
+        order.append(u)
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            if not visited[v]:
+                visited[v] = 1
+                q.append(v)
+    return order
+
+
+def _dfs_csr(indptr: Sequence[int], indices: Sequence[int], source: int) -> List[int]:
+    """Ordem de visita DFS iterativa (ids) sobre a CSR."""
+    visited = bytearray(len(indptr) - 1)
+    order: List[int] = []
+    stack = [source]
+    while stack:
+        u = stack.pop()
+        if visited[u]:
+            continue
+        visited[u] = 1
+        order.append(u)
+        # empilhar vizinhos (inverso para ordem natural)
+        for k in range(indptr[u + 1] - 1, indptr[u] - 1, -1):
+            v = indices[k]
+            if not visited[v]:
+                stack.append(v)
+    return order
+
+
+def _sift_up(heap: MutableSequence[int], pos: MutableSequence[int],
+             dist: Sequence[float], i: int) -> None:
+    """Sobe heap[i] enquanto a distância for menor que a do pai."""
+    v = heap[i]
+    d = dist[v]
+    while i > 0:
+        parent = (i - 1) >> 1
+        p = heap[parent]
+        if dist[p] <= d:
+            break
+        heap[i] = p
+        pos[p] = i
+        i = parent
+    heap[i] = v
+    pos[v] = i
+
+
+def _sift_down(heap: MutableSequence[int], pos: MutableSequence[int],
+               dist: Sequence[float], i: int, n: int) -> None:
+    """Desce heap[i] enquanto algum filho tiver distância menor."""
+    v = heap[i]
+    d = dist[v]
+    while True:
+        c = 2 * i + 1
+        if c >= n:
+            break
+        if c + 1 < n and dist[heap[c + 1]] < dist[heap[c]]:
+            c += 1
+        child = heap[c]
+        if d <= dist[child]:
+            break
+        heap[i] = child
+        pos[child] = i
+        i = c
+    heap[i] = v
+    pos[v] = i
+
+
+def _dijkstra_csr(indptr: Sequence[int], indices: Sequence[int], weights: Sequence[float],
+                  source: int, target: int,
+                  dist: MutableSequence[float], prev: MutableSequence[int],
+                  heap: MutableSequence[int], pos: MutableSequence[int]) -> None:
+    """
+    Núcleo do Dijkstra sobre a CSR (ids inteiros). Preenche dist (inf nos
+    não alcançados) e prev (-1 = sem predecessor) recebidos já alocados.
+    Com target >= 0 para assim que target sai do heap (distância definitiva).
+    heap/pos são buffers de tamanho V para o heap indexado: pos[v] é o índice
+    de v no heap ou -1, e relaxar um vértice já no heap faz decrease-key
+    (o heap nunca passa de V entradas e não há entradas obsoletas).
+    Compilado com numba.njit quando disponível.
+    """
+    dist[source] = 0.0
+    heap[0] = source
+    pos[source] = 0
+    n = 1
+    while n > 0:
+        u = heap[0]
+        if u == target:
+            break
+        pos[u] = -1
+        n -= 1
+        if n > 0:
+            heap[0] = heap[n]
+            _sift_down(heap, pos, dist, 0, n)
+        d = dist[u]
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            alt = d + weights[k]
+            if alt < dist[v]:
+                dist[v] = alt
+                prev[v] = u
+                i = pos[v]
+                if i < 0:
+                    i = n
+                    heap[n] = v
+                    n += 1
+                _sift_up(heap, pos, dist, i)
+
+
+if njit is not None:
+    # a primeira chamada paga a compilação; cache=True a reaproveita entre execuções
+    _sift_up = njit(cache=True)(_sift_up)
+    _sift_down = njit(cache=True)(_sift_down)
+    _dijkstra_csr = njit(cache=True)(_dijkstra_csr)
+
+try:
+    # extensão Cython opcional (ver _graph_kernels.pyx); quando compilada,
+    # tem precedência sobre numba e sobre as versões em Python puro acima
+    from _graph_kernels import (  # type: ignore[no-redef, import-not-found]
+        bfs_csr as _bfs_csr, dfs_csr as _dfs_csr, dijkstra_csr as _dijkstra_csr_c)
+except ImportError:
+    _dijkstra_csr_c = None
 
 
 class Graph:
-    def __init__(self, directed: bool = False):
+    def __init__(self, directed: bool = False) -> None:
         # adj[u] = list of (v, weight)
-        self.adj: Dict[Any, List[Tuple[Any, float]]] = defaultdict(list)
+        # dict simples: ler adj nunca cria vértices por acidente
+        self.adj: Dict[Any, List[Tuple[Any, float]]] = {}
         self.directed = directed
+        # CSR: arestas de u em indices/weights[indptr[u]:indptr[u + 1]]
+        self.v2id: Dict[Any, int] = {}
+        self.id2v: List[Any] = []
+        self.indptr: 'array[int]' = array('i', [0])
+        self.indices: 'array[int]' = array('i')
+        self.weights: 'array[float]' = array('d')
+        self.frozen = True  # False quando a CSR está desatualizada
+        # resultados do Dijkstra das últimas origens (LRU na ordem do dict):
+        # source -> (dist, prev, limite); dist[v] <= limite já é definitivo
+        # (limite = inf para execução completa)
+        self._dijkstra_cache: Dict[Any, Tuple[Any, Any, float]] = {}
 
-    def add_vertex(self, v: Any):
+    def _invalidate(self) -> None:
+        """Descarta a CSR e os Dijkstras memorizados após alterar o grafo."""
+        self.frozen = False
+        self._dijkstra_cache.clear()
+
+    def add_vertex(self, v: Any) -> None:
+        # rótulos internados: buscas no dict comparam ponteiros antes do conteúdo
+        if isinstance(v, str):
+            v = sys.intern(v)
         if v not in self.adj:
             self.adj[v] = []
+            self._invalidate()
 
-    def add_edge(self, u: Any, v: Any, weight: float = 1.0):
-        self.adj[u].append((v, weight))
+    def add_edge(self, u: Any, v: Any, weight: float = 1.0) -> None:
+        if isinstance(u, str):
+            u = sys.intern(u)
+        if isinstance(v, str):
+            v = sys.intern(v)
+        # os dois extremos sempre viram vértices, inclusive no grafo dirigido
+        self.adj.setdefault(u, []).append((v, weight))
+        v_edges = self.adj.setdefault(v, [])
         if not self.directed:
-            self.adj[v].append((u, weight))
+            v_edges.append((u, weight))
+        self._invalidate()
 
     def vertices(self) -> List[Any]:
         return list(self.adj.keys())
 
-    def bfs(self, start) -> List[Any]:
+    def freeze(self) -> None:
+        """Compila a lista de adjacência em CSR (se mudou desde o último freeze)."""
+        if self.frozen:
+            return
+        id2v = list(self.adj)
+        v2id = {v: i for i, v in enumerate(id2v)}
+        indptr = array('i', [0])
+        indices = array('i')
+        weights = array('d')
+        for u in id2v:
+            for v, w in self.adj[u]:
+                indices.append(v2id[v])
+                weights.append(w)
+            indptr.append(len(indices))
+        self.v2id, self.id2v = v2id, id2v
+        self.indptr, self.indices, self.weights = indptr, indices, weights
+        self.frozen = True
+
+    def bfs(self, start: Any) -> List[Any]:
         """Retorna ordem de visita BFS a partir de start."""
-        visited: Set[Any] = set()
-        order = []
-        q = deque()
-        q.append(start)
-        visited.add(start)
-        while q:
-            u = q.popleft()
-            order.append(u)
-            for v, _ in self.adj.get(u, []):
-                if v not in visited:
-                    visited.add(v)
-                    q.append(v)
-        return order
-
-    def dfs(self, start) -> List[Any]:
+        self.freeze()
+        s = self.v2id.get(start)
+        if s is None:
+            return [start]
+        id2v = self.id2v
+        return [id2v[i] for i in _bfs_csr(self.indptr, self.indices, s)]
+
+    def dfs(self, start: Any) -> List[Any]:
         """Retorna ordem de visita DFS (iterativa)."""
-        visited = set()
-        order = []
-        stack = [start]
-        while stack:
-            u = stack.pop()
-            if u in visited:
-                continue
-            visited.add(u)
-            order.append(u)
-            # empilhar vizinhos (inverso para ordem natural)
-            neighbors = [v for v, _ in self.adj.get(u, [])]
-            for v in reversed(neighbors):
-                if v not in visited:
-                    stack.append(v)
-        return order
-
-    def dijkstra(self, source) -> Tuple[Dict[Any, float], Dict[Any, Any]]:
+        self.freeze()
+        s = self.v2id.get(start)
+        if s is None:
+            return [start]
+        id2v = self.id2v
+        return [id2v[i] for i in _dfs_csr(self.indptr, self.indices, s)]
+
+    def _dijkstra_upto(self, source: Any, target: Optional[int] = None) -> Tuple[Any, Any]:
+        """
+        Roda o kernel a partir de source e retorna (dist, prev) indexados por id
+        (prev = -1 sem predecessor). Com target (id), para ao fixar a distância
+        dele; os demais vértices podem ficar com valores parciais.
+        Reaproveita a última execução a partir de source enquanto o grafo não
+        muda, se ela já fixou a distância pedida; só as _DIJKSTRA_CACHE_SIZE
+        origens usadas mais recentemente ficam guardadas.
+        """
+        cache = self._dijkstra_cache
+        cached = cache.pop(source, None)
+        if cached is not None:
+            cache[source] = cached  # reinserir marca como a mais recente
+            dist_id, prev_id, bound = cached
+            if (bound == _INF) if target is None else (dist_id[target] <= bound):
+                return dist_id, prev_id
+        self.freeze()
+        V = len(self.id2v)
+        s = self.v2id.get(source)
+        t = -1 if target is None else target
+        if _dijkstra_csr_c is not None:
+            dist_id = array('d', [_INF]) * V
+            prev_id = array('i', [-1]) * V
+            if s is not None:
+                _dijkstra_csr_c(self.indptr, self.indices, self.weights, s, t, dist_id, prev_id)
+        elif njit is not None:
+            dist_id = np.full(V, np.inf)
+            prev_id = np.full(V, -1, dtype=np.int32)
+            if s is not None:
+                _dijkstra_csr(np.frombuffer(self.indptr, dtype=np.intc),
+                              np.frombuffer(self.indices, dtype=np.intc),
+                              np.frombuffer(self.weights, dtype=np.float64),
+                              s, t, dist_id, prev_id,
+                              np.empty(V, dtype=np.int32), np.full(V, -1, dtype=np.int32))
+        else:
+            dist_id = [_INF] * V
+            prev_id = [-1] * V
+            if s is not None:
+                _dijkstra_csr(self.indptr, self.indices, self.weights, s, t, dist_id, prev_id,
+                              [0] * V, [-1] * V)
+        # parando em target, só as distâncias até dist[target] são definitivas
+        # (se target é inalcançável a execução foi completa e o limite é inf)
+        bound = _INF if target is None else dist_id[target]
+        cache[source] = (dist_id, prev_id, bound)
+        if len(cache) > _DIJKSTRA_CACHE_SIZE:
+            del cache[next(iter(cache))]
+        return dist_id, prev_id
+
+    def dijkstra(self, source: Any) -> Tuple[Dict[Any, float], Dict[Any, Any]]:
         """
         Retorna (dist, prev) onde:
         - dist[v] = distância mínima de source a v
         - prev[v] = predecessor de v no caminho mínimo
         Complexidade: O(E log V)
         """
-        dist = {v: float('inf') for v in self.adj}
-        prev = {v: None for v in self.adj}
-        if source not in self.adj:
-            return dist, prev
-        dist[source] = 0
-        heap = [(0, source)]
-        while heap:
-            d, u = heapq.heappop(heap)
-            if d > dist[u]:
-                continue
-            for v, w in self.adj[u]:
-                alt = dist[u] + w
-                if alt < dist.get(v, float('inf')):
-                    dist[v] = alt
-                    prev[v] = u
-                    heapq.heappush(heap, (alt, v))
-                    # se v não estava presente como chave, garantimos integridade
-                    if v not in dist:
-                        dist[v] = alt
+        dist_id, prev_id = self._dijkstra_upto(source)
+        if not isinstance(dist_id, list):
+            dist_id, prev_id = dist_id.tolist(), prev_id.tolist()
+        id2v = self.id2v
+        dist = dict(zip(id2v, dist_id))
+        prev = {v: (id2v[p] if p >= 0 else None) for v, p in zip(id2v, prev_id)}
         return dist, prev
 
-    def shortest_path(self, source, target) -> Tuple[float, List[Any]]:
-        """Reconstroi caminho mínimo de source a target (usando dijkstra)."""
-        dist, prev = self.dijkstra(source)
-        if dist.get(target, float('inf')) == float('inf'):
-            return float('inf'), []
+    def shortest_path(self, source: Any, target: Any) -> Tuple[float, List[Any]]:
+        """
+        Reconstroi caminho mínimo de source a target (usando dijkstra).
+        O Dijkstra para assim que target é fixado, sem explorar o resto do grafo.
+        """
+        self.freeze()
+        t = self.v2id.get(target)
+        if t is None:
+            return _INF, []
+        dist_id, prev_id = self._dijkstra_upto(source, t)
+        if dist_id[t] == _INF:
+            return _INF, []
+        id2v = self.id2v
         path = []
-        cur = target
-        while cur is not None:
-            path.append(cur)
-            cur = prev.get(cur)
+        cur = t
+        while cur >= 0:
+            path.append(id2v[cur])
+            cur = prev_id[cur]
         path.reverse()
-        return dist[target], path
+        return float(dist_id[t]), path
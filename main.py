@@ -59,7 +59,7 @@ def remover_cidade():
 
 def mostrar_percursos():
     def visit(node):
-        print(f"ID: {node.key} | Nome: {node.name} | Altura: {getattr(node, 'height', '—')}")
+        print(f"ID: {node.key} | Nome: {node.name} | Balanço: {getattr(node, 'bf', '—')}")
     print("Pré-ordem:")
     avl.preorder(visit)
     print("\nIn-ordem:")
@@ -97,12 +97,12 @@ def menu_grafo(node):
         print("0. Voltar")
         op = input("Escolha: ").strip()
         if op == "1":
-            v = input("Nome/ID do bairro a adicionar: ").strip()
+            v = sys.intern(input("Nome/ID do bairro a adicionar: ").strip())
             g.add_vertex(v)
             print(f"Bairro '{v}' adicionado.")
         elif op == "2":
-            u = input("Origem (bairro): ").strip()
-            v = input("Destino (bairro): ").strip()
+            u = sys.intern(input("Origem (bairro): ").strip())
+            v = sys.intern(input("Destino (bairro): ").strip())
             w_str = input("Peso (distância) [enter=1]: ").strip()
             w = float(w_str) if w_str else 1.0
             g.add_vertex(u)
@@ -112,7 +112,7 @@ def menu_grafo(node):
         elif op == "3":
             print("Bairros:", g.vertices())
         elif op == "4":
-            start = input("Bairro inicial: ").strip()
+            start = sys.intern(input("Bairro inicial: ").strip())
             if start not in g.adj:
                 print("Bairro não existe.")
             else:
@@ -120,7 +120,7 @@ def menu_grafo(node):
                 print("Ordem BFS:", ordem)
                 show_complexity("bfs")
         elif op == "5":
-            start = input("Bairro inicial: ").strip()
+            start = sys.intern(input("Bairro inicial: ").strip())
             if start not in g.adj:
                 print("Bairro não existe.")
             else:
@@ -128,8 +128,8 @@ def menu_grafo(node):
                 print("Ordem DFS:", ordem)
                 show_complexity("dfs")
         elif op == "6":
-            src = input("Bairro origem: ").strip()
-            dst = input("Bairro destino: ").strip()
+            src = sys.intern(input("Bairro origem: ").strip())
+            dst = sys.intern(input("Bairro destino: ").strip())
             if src not in g.adj or dst not in g.adj:
                 print("Origem ou destino inexistente.")
             else:
@@ -152,7 +152,7 @@ def main_menu():
         print("2. Remover cidade")
         print("3. Mostrar percursos da árvore (pré/in/post)")
         print("4. Acessar grafo local de uma cidade")
-        print("5. Balancear a árvore AVL com DSW (apenas para comparação - usa BST temporária)")
+        print("5. Exportar a árvore AVL para BST balanceada (apenas para comparação - usa BST temporária)")
         print("0. Sair")
         op = input("Escolha: ").strip()
         if op == "1":
@@ -166,18 +166,16 @@ def main_menu():
             if node:
                 menu_grafo(node)
         elif op == "5":
-            # demonstração: converte AVL para BST, aplica DSW e oferece impressão
-            print("Operação experimental: exportando AVL para BST, aplicando DSW (balanceamento por vine).")
+            # demonstração: converte AVL para BST balanceada e oferece impressão
+            print("Operação experimental: exportando AVL para BST balanceada.")
             from arvore_binaria import BinarySearchTree
-            bst = BinarySearchTree()
+            items = []
+            avl.inorder(lambda n: items.append((n.key, n.name, n.data)))
 
-            def collect_insert(n):
-                bst.insert(n.key, n.name, n.data)
-            avl.inorder(collect_insert)
-
-            print("BST criada a partir de AVL (inorder). Aplicando DSW...")
-            bst.dsw_balance()
-            print("Árvore BST balanceada (DSW). Percurso inorder da árvore resultante:")
+            # o inorder já sai ordenado: a BST nasce balanceada (ponto médio),
+            # sem precisar da vine + compressões do DSW
+            bst = BinarySearchTree.from_sorted(items)
+            print("Árvore BST balanceada criada a partir da AVL (inorder). Percurso inorder da árvore resultante:")
             bst.inorder(lambda x: print(f"ID {x.key} | Nome {x.name}"))
             print("Observação: essa operação não altera a AVL original — é apenas demonstração.")
         elif op == "0":
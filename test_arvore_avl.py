@@ -0,0 +1,156 @@
+"""
+test_arvore_avl.py
+Testes da AVL em pool: invariantes após inserções/remoções aleatórias e ciclo
+de vida das vistas (AVLNode) e dos nós entregues pelos percursos (AVLEntry).
+Rodar com: python -m unittest test_arvore_avl
+"""
+
+import random
+import unittest
+
+from arvore_avl import NIL, AVLEntry, AVLTree
+
+
+def check_invariants(tree):
+    """Confere pais, bf e altura pelo pool; devolve as chaves em ordem."""
+    left, right, parent, bf, keys = tree._left, tree._right, tree._parent, tree._bf, tree._keys
+
+    def height(i, lo, hi):
+        if i == NIL:
+            return 0
+        assert lo is None or keys[i] > lo
+        assert hi is None or keys[i] < hi
+        for c in (left[i], right[i]):
+            if c != NIL:
+                assert parent[c] == i
+        hl = height(left[i], lo, keys[i])
+        hr = height(right[i], keys[i], hi)
+        assert bf[i] == hl - hr and abs(hl - hr) <= 1
+        return 1 + max(hl, hr)
+
+    if tree._root != NIL:
+        assert parent[tree._root] == NIL
+    height(tree._root, None, None)
+    out = []
+    tree.inorder(lambda n: out.append(n.key))
+    assert len(out) == tree.size
+    return out
+
+
+class TestInvariants(unittest.TestCase):
+    def test_random_insert_remove(self):
+        for seed in range(20):
+            rng = random.Random(seed)
+            tree = AVLTree()
+            ref = set()
+            for _ in range(300):
+                k = rng.randint(0, 100)
+                if rng.random() < 0.6:
+                    tree.insert(k, str(k), {})
+                    ref.add(k)
+                else:
+                    tree.remove(k)
+                    ref.discard(k)
+                self.assertEqual(check_invariants(tree), sorted(ref))
+            for k in range(101):
+                node = tree.search(k)
+                self.assertEqual(node is not None, k in ref)
+                if node is not None:
+                    self.assertEqual((node.key, node.name), (k, str(k)))
+
+    def test_bulk_load_then_mutate(self):
+        for n in range(40):
+            tree = AVLTree()
+            tree.bulk_load([(2 * k, str(k), None) for k in range(n)])
+            self.assertEqual(check_invariants(tree), [2 * k for k in range(n)])
+            for k in range(n):
+                tree.insert(2 * k + 1, "x")
+            tree.remove(0)
+            check_invariants(tree)
+
+    def test_large_keys(self):
+        tree = AVLTree()
+        big = 99999999999999999999
+        tree.insert(big, "grande")
+        tree.insert(-big, "pequena")
+        self.assertEqual(check_invariants(tree), [-big, big])
+        self.assertEqual(tree.search(big).name, "grande")
+
+
+class TestViewLifetime(unittest.TestCase):
+    def test_removed_view_raises_even_after_slot_reuse(self):
+        tree = AVLTree()
+        for k in (5, 3, 8):
+            tree.insert(k, str(k))
+        node = tree.search(5)
+        tree.remove(5)
+        tree.insert(9, "z")  # reaproveita o slot liberado
+        with self.assertRaises(ReferenceError):
+            node.key
+        with self.assertRaises(ReferenceError):
+            node.name = "x"
+        self.assertEqual(tree.search(9).name, "z")
+
+    def test_successor_views_survive_two_child_removal(self):
+        rng = random.Random(1)
+        tree = AVLTree()
+        keys = rng.sample(range(10000), 300)
+        for k in keys:
+            tree.insert(k, str(k))
+        views = {k: tree.search(k) for k in keys}
+        removed = set(keys[:150])
+        for k in keys[:150]:
+            tree.remove(k)
+        for k in range(10000, 10100):
+            tree.insert(k, str(k))
+        for k, view in views.items():
+            if k in removed:
+                self.assertRaises(ReferenceError, lambda: view.name)
+            else:
+                self.assertEqual((view.key, view.name), (k, str(k)))
+                self.assertEqual(view, tree.search(k))
+        check_invariants(tree)
+
+    def test_bulk_load_invalidates_views(self):
+        tree = AVLTree()
+        for k in range(10):
+            tree.insert(k, str(k))
+        node = tree.search(7)
+        tree.bulk_load([(1, "a", None)])
+        with self.assertRaises(ReferenceError):
+            node.key
+
+    def test_view_writes_reach_the_tree(self):
+        tree = AVLTree()
+        tree.insert(1, "a")
+        tree.search(1).name = "b"
+        self.assertEqual(tree.search(1).name, "b")
+        self.assertEqual(tree.root, tree.search(1))
+
+
+class TestTraversalEntries(unittest.TestCase):
+    def test_orders(self):
+        tree = AVLTree()
+        for k in (2, 1, 3):
+            tree.insert(k, str(k))
+        for method, expected in (("preorder", [2, 1, 3]),
+                                 ("inorder", [1, 2, 3]),
+                                 ("postorder", [1, 3, 2])):
+            out = []
+            getattr(tree, method)(out.append)
+            self.assertTrue(all(isinstance(e, AVLEntry) for e in out))
+            self.assertEqual([e.key for e in out], expected)
+            self.assertEqual([e.name for e in out], [str(k) for k in expected])
+
+    def test_kept_entry_keeps_its_city(self):
+        tree = AVLTree()
+        tree.insert(5, "cinco", {"id": 5})
+        kept = []
+        tree.inorder(kept.append)
+        tree.remove(5)
+        tree.insert(9, "nove", {"id": 9})
+        self.assertEqual((kept[0].key, kept[0].name, kept[0].data), (5, "cinco", {"id": 5}))
+
+
+if __name__ == "__main__":
+    unittest.main()